@@ -0,0 +1,40 @@
+"""Measure worker cold start: importing app.py and serving the first request
+that has to open a database connection.
+
+Run from the WEBSITE folder:  python bench_startup.py [runs]
+Each run uses a fresh interpreter, so module import costs are included.
+DATABASE_URL must point at a reachable database with the schema applied.
+"""
+import os
+import subprocess
+import sys
+import statistics
+
+SNIPPET = """
+from time import perf_counter
+start = perf_counter()
+import app
+imported = perf_counter()
+resp = app.app.test_client().get('/')  # home page queries StockInventory
+served = perf_counter()
+assert resp.status_code == 200, resp.status_code
+print((imported - start) * 1000, (served - imported) * 1000)
+"""
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = dict(os.environ, JOB_RUNNER_ENABLED='0')
+    imports, first_requests = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', SNIPPET], capture_output=True, text=True, check=True, env=env).stdout
+        imported_ms, served_ms = (float(x) for x in out.split())
+        imports.append(imported_ms)
+        first_requests.append(served_ms)
+    print(f"runs: {runs}")
+    print(f"import app.py:           min {min(imports):.1f} ms, median {statistics.median(imports):.1f} ms")
+    print(f"first DB-backed request: min {min(first_requests):.1f} ms, median {statistics.median(first_requests):.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""Schema management commands, kept out of app.py so web workers never import Alembic.
+
+Run from the WEBSITE folder:
+    flask --app manage db upgrade
+    flask --app manage init-db
+"""
+import os
+
+import flask_migrate
+from flask_migrate import Migrate
+
+from app import app, db
+
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create all tables on a fresh database and stamp it at the latest migration."""
+    db.create_all()
+    flask_migrate.stamp(revision='head')
@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import uuid
+from multiprocessing import resource_tracker
+
+import pytest
+
+# Configure before app.py is imported: a throwaway SQLite database, no job
+# runner thread and a private quote cache segment.
+_tmpdir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmpdir, 'test.db')
+os.environ['JOB_RUNNER_ENABLED'] = '0'
+os.environ['QUOTE_CACHE_NAME'] = 'test_quotes_' + uuid.uuid4().hex[:8]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from decimal import Decimal  # noqa: E402
+
+
+@pytest.fixture
+def stock_app(monkeypatch):
+    monkeypatch.setattr(app_module, 'market_open', lambda now=None: True)
+    app_module._rate_limit_store = None
+    # Each test gets a fresh database, so resync the quote table as a new process would
+    app_module._quotes_synced_at = None
+    with app_module.app.app_context():
+        app_module.db.create_all()
+        yield app_module
+        app_module.db.session.remove()
+        app_module.db.drop_all()
+
+
+@pytest.fixture
+def stock(stock_app):
+    s = stock_app.StockInventory(name='Acme', ticker='AAA', quantity=100, base_price=Decimal('10.00'),
+                                 current_price=Decimal('10.00'), currentMarketPrice=Decimal('10.00'),
+                                 day_high=Decimal('10.00'), day_low=Decimal('10.00'))
+    stock_app.db.session.add(s)
+    stock_app.db.session.commit()
+    stock_app.publish_quotes([s])
+    return s
+
+
+@pytest.fixture
+def client(stock_app):
+    c = stock_app.app.test_client()
+    c.post('/register', data={'username': 'trader', 'password': 'pw'})
+    user = stock_app.User.query.filter_by(username='trader').first()
+    user.email = 'trader@example.com'
+    stock_app.db.session.commit()
+    c.post('/login', data={'username': 'trader', 'password': 'pw'})
+    return c
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if app_module._quote_cache is not None:
+        shm = app_module._quote_cache.shm
+        # The app unregisters the segment from the resource tracker; re-register so unlink is clean
+        resource_tracker.register(shm._name, 'shared_memory')
+        shm.close()
+        shm.unlink()
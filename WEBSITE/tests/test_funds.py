@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+
+def make_admin(stock_app):
+    user = stock_app.User.query.filter_by(username='trader').first()
+    user.role = 'admin'
+    stock_app.db.session.commit()
+    return user
+
+
+def test_parse_money_rounds_and_rejects_bad_values(stock_app):
+    assert stock_app.parse_money('12.345') == Decimal('12.35')
+    assert stock_app.parse_money('999999999999.99') == stock_app.MAX_MONEY
+    for bad in ('abc', 'nan', 'inf', '1e40', '1000000000000', None):
+        assert stock_app.parse_money(bad) is None
+
+
+def test_oversized_deposit_is_rejected_without_error(stock_app, client):
+    user = make_admin(stock_app)
+    resp = client.post(f'/add_funds_user/{user.id}', data={'amount': '1e40'})
+
+    assert resp.status_code == 302
+    assert stock_app.db.session.get(stock_app.User, user.id).funds == Decimal('100000.00')
+
+
+def test_ledger_matches_balance_after_every_kind_of_movement(stock_app, stock, client):
+    user = make_admin(stock_app)
+    client.post(f'/add_funds_user/{user.id}', data={'amount': '12.345'})
+    client.post(f'/subtract_funds_user/{user.id}', data={'amount': '2.10'})
+    client.post('/execute_order/AAA', data={'action': 'BUY', 'quantity': '3'})
+    client.post('/execute_order/AAA', data={'action': 'SELL', 'quantity': '1'})
+
+    user = stock_app.db.session.get(stock_app.User, user.id)
+    entries = stock_app.FundsLedger.query.order_by(stock_app.FundsLedger.id).all()
+    assert [e.kind for e in entries] == ['opening', 'deposit', 'withdrawal', 'buy', 'sell']
+    assert user.funds == Decimal('99990.25')
+    assert entries[-1].balance_after == user.funds
+    assert sum(e.amount for e in entries) == user.funds
+    assert stock_app.reconcile_funds() == []
+
+
+def test_reconcile_reports_balance_changed_outside_the_ledger(stock_app, client):
+    user = stock_app.User.query.filter_by(username='trader').first()
+    user.funds += Decimal('5.00')
+    stock_app.db.session.commit()
+
+    mismatches = stock_app.reconcile_funds()
+    assert [(m['username'], m['funds'], m['ledger_total']) for m in mismatches] == [('trader', 100005.0, 100000.0)]
+
+
+def test_deposit_over_the_column_limit_says_why(stock_app, client):
+    user = make_admin(stock_app)
+    client.post(f'/add_funds_user/{user.id}', data={'amount': '999999999999.99'})
+
+    with client.session_transaction() as sess:
+        assert any('cannot exceed' in m for _, m in sess['_flashes'])
+    assert stock_app.db.session.get(stock_app.User, user.id).funds == Decimal('100000.00')
+
+
+def test_add_stock_rejects_a_non_numeric_price(stock_app, client):
+    make_admin(stock_app)
+    resp = client.post('/add_stock', data={'stock_name': 'Bad', 'ticker': 'BAD', 'quantity': '10', 'base_price': 'ten'})
+
+    assert resp.status_code == 302
+    assert stock_app.StockInventory.query.filter_by(ticker='BAD').first() is None
+    client.post('/add_stock', data={'stock_name': 'Good', 'ticker': 'GUD', 'quantity': '10', 'base_price': '4.505'})
+    assert stock_app.StockInventory.query.filter_by(ticker='GUD').one().current_price == Decimal('4.51')
@@ -0,0 +1,162 @@
+import json
+import threading
+from datetime import datetime, time, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def clock(stock_app, monkeypatch):
+    # Freezes datetime.now() inside app.py; everything else on datetime still works
+    class FrozenDatetime(datetime):
+        current = datetime(2025, 6, 2, 12, 0)  # a Monday
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    monkeypatch.setattr(stock_app, 'datetime', FrozenDatetime)
+    return FrozenDatetime
+
+
+@pytest.fixture
+def flaky_job(stock_app, monkeypatch):
+    calls = []
+
+    def run(args):
+        calls.append(args)
+        raise RuntimeError('boom')
+    monkeypatch.setitem(stock_app.JOBS, 'flaky', {'run': run, 'trigger': 'market_close', 'delay': stock_app.EOD_JOB_DELAY})
+    return calls
+
+
+def add_event(stock_app, start, end, event_type, **kwargs):
+    stock_app.db.session.add(stock_app.CalendarEvent(title=event_type, start_datetime=start, end_datetime=end,
+                                                     event_type=event_type, **kwargs))
+    stock_app.db.session.commit()
+
+
+def test_next_market_close_skips_weekends_and_holidays(stock_app):
+    assert stock_app.next_market_close(datetime(2025, 6, 2, 12, 0)) == datetime(2025, 6, 2, 17, 0)
+    assert stock_app.next_market_close(datetime(2025, 6, 6, 18, 0)) == datetime(2025, 6, 9, 17, 0)
+    assert stock_app.next_market_close(datetime(2025, 12, 24, 18, 0)) == datetime(2025, 12, 26, 17, 0)
+
+
+def test_next_market_close_follows_calendar_events(stock_app):
+    add_event(stock_app, datetime(2025, 6, 9, 0, 0), datetime(2025, 6, 9, 23, 59), 'closed')
+    add_event(stock_app, datetime(2025, 6, 10, 0, 0), datetime(2025, 6, 10, 23, 59), 'custom_hours',
+              custom_open_time=time(10, 0), custom_close_time=time(13, 0))
+    assert stock_app.next_market_close(datetime(2025, 6, 6, 18, 0)) == datetime(2025, 6, 10, 13, 0)
+    assert stock_app.next_market_open(datetime(2025, 6, 6).date()) == datetime(2025, 6, 10, 10, 0)
+
+
+def test_scheduled_run_pins_its_session_day(stock_app, clock):
+    stock_app.ensure_jobs()
+    job = stock_app.ScheduledJob.query.filter_by(name='compress_end_of_day').one()
+    assert job.next_run_at == datetime(2025, 6, 2, 17, 5)
+    assert json.loads(job.args) == {'day': '2025-06-02', 'roll_range': True}
+
+
+@pytest.mark.parametrize('picked_up, rolled', [
+    (datetime(2025, 6, 3, 7, 0), True),   # late, but before Tuesday's open
+    (datetime(2025, 6, 3, 9, 0), False),  # Tuesday's session is running
+])
+def test_late_eod_run_compacts_the_scheduled_day(stock_app, clock, monkeypatch, picked_up, rolled):
+    compacted, rolls = [], []
+    monkeypatch.setattr(stock_app, 'compress_all_stocks', compacted.append)
+    monkeypatch.setattr(stock_app, 'roll_day_range', lambda: rolls.append(True))
+    stock_app.ensure_jobs()
+    clock.current = picked_up
+    assert stock_app.run_due_jobs() == 1
+    assert compacted == [datetime(2025, 6, 2).date()]
+    assert bool(rolls) == rolled
+    job = stock_app.ScheduledJob.query.filter_by(name='compress_end_of_day').one()
+    assert job.last_status == 'succeeded'
+    assert job.next_run_at == datetime(2025, 6, 3, 17, 5)
+    assert json.loads(job.args)['day'] == '2025-06-03'
+
+
+def test_claim_job_refuses_a_leased_job(stock_app, clock):
+    job = stock_app.ScheduledJob(name='simulate_fast_ticks', next_run_at=clock.current - timedelta(minutes=1),
+                                 locked_by='other:1', locked_until=clock.current + timedelta(minutes=5))
+    stock_app.db.session.add(job)
+    stock_app.db.session.commit()
+    assert not stock_app.claim_job(job.id)
+    clock.current += timedelta(minutes=6)
+    assert stock_app.claim_job(job.id)
+    stock_app.db.session.refresh(job)
+    assert job.locked_until == clock.current + timedelta(seconds=stock_app.JOB_LEASE_SECONDS)
+
+
+def test_retry_backoff_then_failed_then_next_trigger(stock_app, clock, flaky_job):
+    job = stock_app.ScheduledJob(name='flaky', next_run_at=clock.current)
+    stock_app.db.session.add(job)
+    stock_app.db.session.commit()
+    delays = []
+    for _ in range(stock_app.JOB_MAX_ATTEMPTS - 1):
+        assert stock_app.run_due_jobs() == 1
+        job = stock_app.ScheduledJob.query.filter_by(name='flaky').one()
+        assert job.last_status == 'retrying'
+        delays.append(job.next_run_at - clock.current)
+        assert stock_app.run_due_jobs() == 0
+        clock.current = job.next_run_at
+    assert delays == [timedelta(seconds=stock_app.JOB_RETRY_SECONDS), timedelta(seconds=stock_app.JOB_RETRY_SECONDS * 2)]
+    assert stock_app.run_due_jobs() == 1
+    job = stock_app.ScheduledJob.query.filter_by(name='flaky').one()
+    assert job.last_status == 'failed'
+    assert job.attempts == 0 and job.failure_count == stock_app.JOB_MAX_ATTEMPTS
+    assert job.next_run_at == datetime(2025, 6, 2, 17, 5)
+    assert len(flaky_job) == stock_app.JOB_MAX_ATTEMPTS
+
+
+def test_queue_job_only_accepts_idle_jobs(stock_app, clock):
+    stock_app.ensure_jobs()
+    job = stock_app.ScheduledJob.query.filter_by(name='compress_end_of_day').one()
+    assert stock_app.queue_job('compress_end_of_day', {'day': '2025-05-30'})
+    stock_app.db.session.refresh(job)
+    assert job.next_run_at == clock.current and json.loads(job.args) == {'day': '2025-05-30'}
+
+    # Due: a second request must not replace the queued arguments
+    assert not stock_app.queue_job('compress_end_of_day', {'day': '2025-05-29'})
+
+    job.next_run_at = clock.current + timedelta(hours=1)
+    job.last_status = 'retrying'
+    stock_app.db.session.commit()
+    assert not stock_app.queue_job('compress_end_of_day')
+
+    job.last_status = 'failed'
+    job.locked_by = 'other:1'
+    job.locked_until = clock.current + timedelta(minutes=5)
+    stock_app.db.session.commit()
+    assert not stock_app.queue_job('compress_end_of_day')
+    stock_app.db.session.refresh(job)
+    assert json.loads(job.args) == {'day': '2025-05-30'}
+
+
+def test_runner_survives_an_unreachable_database(stock_app, monkeypatch):
+    attempts = []
+
+    def ensure_jobs():
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise RuntimeError('database unreachable')
+        stock_app._job_runner_stop.set()
+    monkeypatch.setattr(stock_app, 'ensure_jobs', ensure_jobs)
+    monkeypatch.setattr(stock_app, 'run_due_jobs', lambda: 0)
+    monkeypatch.setattr(stock_app, 'JOB_POLL_SECONDS', 0)
+    try:
+        stock_app.job_runner_loop()
+    finally:
+        stock_app._job_runner_stop.clear()
+    assert len(attempts) == 2
+
+
+def test_dead_runner_thread_is_replaced(stock_app, monkeypatch):
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    monkeypatch.setattr(stock_app, '_job_runner_thread', dead)
+    monkeypatch.setattr(stock_app, 'job_runner_loop', lambda: None)
+    thread = stock_app.start_job_runner()
+    assert thread is not dead
+    thread.join()
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+from sqlalchemy import text
+
+
+def test_init_db_stamps_the_latest_migration(stock_app):
+    import manage
+    from alembic.script import ScriptDirectory
+    from flask_migrate import upgrade
+    stock_app.db.drop_all()
+
+    result = stock_app.app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    head = ScriptDirectory.from_config(manage.migrate.get_config()).get_current_head()
+    assert stock_app.db.session.execute(text('SELECT version_num FROM alembic_version')).scalar() == head
+    upgrade(directory=manage.migrate.directory)  # nothing left to apply, so no "table already exists"
+    stock_app.db.session.execute(text('DROP TABLE alembic_version'))
+    stock_app.db.session.commit()
+
+
+def test_importing_the_app_does_not_load_alembic():
+    website = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', "import sys, app; print(sorted(m for m in sys.modules if m.startswith(('alembic', 'flask_migrate'))))"],
+                         cwd=website, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == '[]'
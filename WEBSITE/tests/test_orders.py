@@ -0,0 +1,96 @@
+import re
+from decimal import Decimal
+
+
+def preview(client, action='BUY', quantity=2):
+    html = client.post('/order_preview/AAA', data={'action': action, 'quantity': str(quantity)}).get_data(as_text=True)
+    coid = re.search(r'name="client_order_id" value="([^"]+)"', html)
+    quote = re.search(r'name="quote" value="([^"]+)"', html)
+    return (coid.group(1), quote.group(1)) if coid and quote else (None, None)
+
+
+def user_funds(app):
+    return app.User.query.filter_by(username='trader').first().funds
+
+
+def test_duplicate_client_order_id_returns_original_order(stock_app, stock, client):
+    coid, quote = preview(client)
+    first = client.post('/execute_order/AAA', data={'client_order_id': coid, 'quote': quote})
+    second = client.post('/execute_order/AAA', data={'client_order_id': coid, 'quote': quote})
+
+    assert first.status_code == 302
+    assert second.headers['Location'] == first.headers['Location']
+    assert stock_app.Order.query.count() == 1
+    assert user_funds(stock_app) == Decimal('99980.00')
+    assert stock_app.StockInventory.query.first().quantity == 98
+
+
+def test_concurrent_duplicate_falls_back_to_committed_order(stock_app, stock, client, monkeypatch):
+    coid, quote = preview(client)
+    user_id = stock_app.User.query.filter_by(username='trader').first().id
+    # Another worker committed the same client_order_id after our duplicate check ran
+    stock_app.db.session.add(stock_app.Order(
+        id=42, user_id=user_id, stock_id=stock.stockId, action='BUY', quantity=2,
+        price_per_stock=Decimal('10.00'), total_amount=Decimal('20.00'),
+        status='executed', client_order_id=coid))
+    stock_app.db.session.commit()
+    real_find = stock_app.find_client_order
+    calls = []
+
+    def find_after_race(client_order_id):
+        calls.append(client_order_id)
+        return None if len(calls) == 1 else real_find(client_order_id)
+
+    monkeypatch.setattr(stock_app, 'find_client_order', find_after_race)
+    resp = client.post('/execute_order/AAA', data={'client_order_id': coid, 'quote': quote})
+
+    assert len(calls) == 2
+    assert resp.headers['Location'].endswith('/order_confirmation/42')
+    assert stock_app.Order.query.count() == 1
+    assert user_funds(stock_app) == Decimal('100000.00')
+
+
+def test_expired_quote_is_rejected(stock_app, stock, client, monkeypatch):
+    coid, quote = preview(client)
+    monkeypatch.setattr(stock_app, 'QUOTE_TTL_SECONDS', -1)
+    resp = client.post('/execute_order/AAA', data={'client_order_id': coid, 'quote': quote})
+
+    assert resp.headers['Location'].endswith('/trade/AAA')
+    assert stock_app.Order.query.count() == 0
+
+
+def test_quote_for_another_order_is_rejected(stock_app, stock, client):
+    _, quote = preview(client)
+    other_coid, _ = preview(client)
+    resp = client.post('/execute_order/AAA', data={'client_order_id': other_coid, 'quote': quote})
+
+    assert resp.headers['Location'].endswith('/trade/AAA')
+    assert stock_app.Order.query.count() == 0
+    assert user_funds(stock_app) == Decimal('100000.00')
+
+
+def test_only_buy_and_sell_are_accepted(stock_app, stock, client):
+    assert preview(client, action='HOLD') == (None, None)
+    assert client.post('/order_preview/AAA', data={'quantity': '1'}).status_code == 302
+    resp = client.post('/execute_order/AAA', data={'action': 'HOLD', 'quantity': '1'})
+
+    assert resp.headers['Location'].endswith('/trade/AAA')
+    assert client.post('/execute_order/AAA', data={'quantity': '1'}).status_code == 302
+    assert stock_app.Order.query.count() == 0
+
+
+def test_trade_page_posts_go_through_the_preview(stock_app, stock, client):
+    html = client.get('/trade/AAA').get_data(as_text=True)
+    assert 'action="/order_preview/AAA"' in html
+    for _ in range(2):
+        resp = client.post('/trade/aaa', data={'action': 'BUY', 'quantity': '2'})
+        assert resp.status_code == 200
+        assert 'name="client_order_id"' in resp.get_data(as_text=True)
+    assert stock_app.Order.query.count() == 0
+    assert stock_app.StockInventory.query.first().quantity == 100
+
+
+def test_oversized_client_order_id_is_rejected(stock_app, stock, client):
+    resp = client.post('/execute_order/AAA', data={'client_order_id': 'x' * 65, 'action': 'BUY', 'quantity': '1'})
+    assert resp.status_code == 302
+    assert stock_app.Order.query.count() == 0
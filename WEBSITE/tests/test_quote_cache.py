@@ -0,0 +1,116 @@
+import uuid
+from decimal import Decimal
+from multiprocessing import resource_tracker
+
+import pytest
+
+
+@pytest.fixture
+def cache(stock_app):
+    c = stock_app.QuoteCache('test_cache_' + uuid.uuid4().hex[:8], epoch=7, slots=8)
+    yield c
+    resource_tracker.register(c.shm._name, 'shared_memory')
+    c.shm.close()
+    c.shm.unlink()
+
+
+def test_publish_get_and_discard(stock_app, cache):
+    assert cache.get(3) is None
+    assert cache.publish([(3, 1.0, 12.5, 13.0, 12.0, 12.25, 40.0)])
+    assert cache.get(3) == stock_app.Quote(12.5, 13.0, 12.0, 12.25, 40.0)
+    quotes, updated_at = cache.snapshot()
+    assert list(quotes) == [3] and updated_at > 0
+    cache.discard(3)
+    assert cache.get(3) is None
+    assert cache.get(99) is None
+
+
+def test_replace_drops_missing_rows(stock_app, cache):
+    cache.publish([(1, 1.0, 1, 1, 1, 1, 1), (2, 1.0, 2, 2, 2, 2, 2)])
+    cache.publish([(2, 1.0, 3, 3, 3, 3, 3)], replace=True)
+    quotes, _ = cache.snapshot()
+    assert quotes == {2: stock_app.Quote(3, 3, 3, 3, 3)}
+
+
+def test_odd_version_reads_as_miss(stock_app, cache):
+    cache.publish([(1, 1.0, 1, 1, 1, 1, 1)])
+    version, epoch, in_use, updated_at = cache.HEADER.unpack_from(cache.buf, 0)
+    # A writer that died between its two version bumps
+    cache.HEADER.pack_into(cache.buf, 0, version + 1, epoch, in_use, updated_at)
+    assert cache.get(1) is None
+    assert cache.snapshot() is None
+
+
+def test_other_epoch_is_a_miss(stock_app, cache):
+    cache.publish([(1, 1.0, 1, 1, 1, 1, 1)])
+    other = stock_app.QuoteCache(cache.shm.name, epoch=8, slots=8)
+    assert other.get(1) is None
+    assert not other.publish([(1, 1.0, 2, 2, 2, 2, 2)])
+    assert other.publish([(1, 1.0, 2, 2, 2, 2, 2)], replace=True)
+    assert other.get(1).current == 2
+    assert cache.get(1) is None
+    other.shm.close()
+
+
+def test_first_use_resyncs_a_stale_segment(stock_app, stock, client):
+    stock_app.get_quote_cache().publish([(stock.stockId, 1.0, 99.0, 99.0, 99.0, 99.0, 1.0)])
+    # Price written outside the app, as a previous run or a SQL console would
+    stock.current_price = Decimal('11.00')
+    stock_app.db.session.commit()
+    stock_app._quotes_synced_at = None
+    assert b'11.0' in client.get('/market').data
+    assert stock_app.get_quote_cache().get(stock.stockId).current == 11.0
+
+
+def test_market_uses_the_table_only(stock_app, stock, client, monkeypatch):
+    stock_app.get_quote_cache()
+
+    def no_queries(*args, **kwargs):
+        raise AssertionError('queried the database')
+    monkeypatch.setattr(stock_app.StockInventory, 'query', property(no_queries))
+    monkeypatch.setattr(stock_app, 'DEMO_TICK_SECONDS', 60)
+    rows = client.get('/market_demo_data').get_json()
+    assert rows[0]['ticker'] == 'AAA' and rows[0]['quantity'] == 100
+
+
+def test_trade_prices_from_the_locked_row(stock_app, stock, client):
+    stock_app.get_quote_cache().publish([(stock.stockId, 1.0, 1.0, 1.0, 1.0, 1.0, 100.0)])
+    client.post('/execute_order/AAA', data={'action': 'BUY', 'quantity': '2'})
+    order = stock_app.Order.query.one()
+    assert order.price_per_stock == Decimal('10.00')
+    assert stock_app.get_quote_cache().get(stock.stockId).quantity == 98
+
+
+def test_publish_rereads_rows_instead_of_trusting_the_caller(stock_app, stock):
+    stock_app.get_quote_cache()
+    stale = stock_app.db.session.get(stock_app.StockInventory, stock.stockId)
+    # Another worker's trade commits after this session loaded the row
+    with stock_app.db.engine.begin() as conn:
+        conn.execute(stock_app.StockInventory.__table__.update().values(quantity=40))
+    assert stale.quantity == 100
+    stock_app.publish_quotes([stale])
+    assert stock_app.get_quote_cache().get(stock.stockId).quantity == 40
+
+
+def test_publish_drops_rows_deleted_meanwhile(stock_app, stock):
+    stock_app.get_quote_cache()
+    stock_id = stock.stockId
+    with stock_app.db.engine.begin() as conn:
+        conn.execute(stock_app.StockInventory.__table__.delete())
+    stock_app.publish_quotes([stock])
+    assert stock_app.get_quote_cache().get(stock_id) is None
+
+
+def test_reader_backs_off_while_a_write_is_in_progress(stock_app, cache, monkeypatch):
+    cache.publish([(1, 1.0, 1, 1, 1, 1, 1)])
+    version, epoch, in_use, updated_at = cache.HEADER.unpack_from(cache.buf, 0)
+    sleeps = []
+
+    def finish_write(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            cache.HEADER.pack_into(cache.buf, 0, version + 2, epoch, in_use, updated_at)
+    monkeypatch.setattr(stock_app, 'sleep', finish_write)
+    cache.HEADER.pack_into(cache.buf, 0, version + 1, epoch, in_use, updated_at)
+    assert cache.get(1).current == 1
+    assert sleeps == [cache.READ_BACKOFF_SECONDS] * 3
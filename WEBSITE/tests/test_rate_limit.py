@@ -0,0 +1,84 @@
+import pytest
+
+
+@pytest.fixture
+def clock(stock_app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(stock_app, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_bucket_allows_burst_then_refills(stock_app, clock):
+    store = stock_app.MemoryRateLimitStore()
+    assert all(store.take('k', 1, 3)[0] for _ in range(3))
+    allowed, retry_after = store.take('k', 1, 3)
+    assert not allowed and retry_after == pytest.approx(1)
+    clock[0] += 1
+    assert store.take('k', 1, 3)[0]
+    assert not store.take('k', 1, 3)[0]
+
+
+def test_evicts_least_recently_used(stock_app, clock, monkeypatch):
+    monkeypatch.setattr(stock_app.MemoryRateLimitStore, 'MAX_KEYS', 2)
+    store = stock_app.MemoryRateLimitStore()
+    store.take('a', 1, 1)
+    store.take('b', 1, 1)
+    store.take('a', 1, 1)
+    store.take('c', 1, 1)
+    assert list(store.buckets) == ['a', 'c']
+
+
+def limit(stock_app, monkeypatch, endpoint, rate, burst, factor=1):
+    monkeypatch.setitem(stock_app.app.config['RATE_LIMITS'], endpoint, (rate, burst))
+    monkeypatch.setitem(stock_app.app.config, 'RATELIMIT_CLIENT_FACTOR', factor)
+
+
+def test_polling_endpoint_gets_json_429(stock_app, stock, monkeypatch):
+    limit(stock_app, monkeypatch, 'market_demo_data', 0.001, 1)
+    c = stock_app.app.test_client()
+    assert c.get('/market_demo_data').status_code == 200
+    resp = c.get('/market_demo_data')
+    assert resp.status_code == 429
+    assert resp.get_json()['error']
+    assert int(resp.headers['Retry-After']) >= 1
+
+
+def test_throttled_form_post_gets_a_bare_429(stock_app, stock, client, monkeypatch):
+    limit(stock_app, monkeypatch, 'order_preview', 0.001, 1)
+    client.post('/order_preview/AAA', data={'action': 'BUY', 'quantity': '1'})
+    resp = client.post('/order_preview/AAA', data={'action': 'BUY', 'quantity': '1'},
+                       headers={'Referer': 'http://localhost/trade/AAA'})
+    assert resp.status_code == 429
+    assert resp.mimetype == 'text/plain'
+    assert int(resp.headers['Retry-After']) >= 1
+
+
+def test_user_and_client_buckets_both_apply(stock_app, stock, client, monkeypatch):
+    limit(stock_app, monkeypatch, 'market_demo_data', 0.001, 2, factor=1.5)
+    # Logged in: the user's own bucket runs out first
+    assert [client.get('/market_demo_data').status_code for _ in range(3)] == [200, 200, 429]
+    # A second account from the same address only gets what is left of the address's 3
+    other = stock_app.app.test_client()
+    other.post('/register', data={'username': 'second', 'password': 'pw'})
+    other.post('/login', data={'username': 'second', 'password': 'pw'})
+    assert [other.get('/market_demo_data').status_code for _ in range(2)] == [200, 429]
+    assert stock_app.app.test_client().get('/market_demo_data').status_code == 429
+
+
+def test_register_and_login_are_limited(stock_app):
+    assert 'register' in stock_app.app.config['RATE_LIMITS']
+    assert 'login' in stock_app.app.config['RATE_LIMITS']
+    c = stock_app.app.test_client()
+    rate, burst = stock_app.app.config['RATE_LIMITS']['register']
+    codes = [c.post('/register', data={'username': f'u{i}', 'password': 'pw'}).status_code
+             for i in range(burst * stock_app.app.config['RATELIMIT_CLIENT_FACTOR'] + 1)]
+    assert codes[-1] == 429 and 429 not in codes[:-1]
+
+
+def test_forwarded_client_address_with_proxy_fix(stock_app, stock, monkeypatch):
+    limit(stock_app, monkeypatch, 'market_demo_data', 0.001, 1)
+    monkeypatch.setattr(stock_app.app, 'wsgi_app', stock_app.ProxyFix(stock_app.app.wsgi_app, x_for=1))
+    c = stock_app.app.test_client()
+    assert c.get('/market_demo_data', headers={'X-Forwarded-For': '10.0.0.1'}).status_code == 200
+    assert c.get('/market_demo_data', headers={'X-Forwarded-For': '10.0.0.2'}).status_code == 200
+    assert c.get('/market_demo_data', headers={'X-Forwarded-For': '10.0.0.1'}).status_code == 429